@@ -1,3 +1,5 @@
+import argparse
+from itertools import chain
 from biocypher import BioCypher
 from pole.adapters.pole_adapter import (
     CustomAdapter
@@ -8,29 +10,99 @@ from pole.adapters.vhp_compoundwiki_adapter import (
 from pole.adapters.aop_adapter import (
     CustomAOPAdapter,
 )
+from pole.dedup import deduplicate_edges, replace_biocypher_edge_dedup
+from pole.ontology_cache import DEFAULT_CACHE_DIR, load_cached_ontology
+from pole.pipeline import build_pipelined
 
-bc = BioCypher(schema_config_path="config/schema_config_vhp.yaml")
-#bc.show_ontology_structure(full=True)
+parser = argparse.ArgumentParser(description="Build the VHP4Safety knowledge graph.")
+parser.add_argument(
+    "--pipelined",
+    action="store_true",
+    help="overlap adapter fetch/transform with BioCypher writes",
+)
+parser.add_argument(
+    "--processes",
+    action="store_true",
+    help="with --pipelined, run adapters in processes instead of threads",
+)
+parser.add_argument(
+    "--aopwiki-dump",
+    nargs="+",
+    metavar="PATH",
+    help="read AOP-Wiki from local RDF dumps (RDF/XML, N-Triples, Turtle, "
+    "optionally gzipped) instead of the SPARQL endpoint",
+)
+parser.add_argument(
+    "--aopwiki-snapshot",
+    metavar="DIR",
+    help="keep AOP-Wiki results in a local snapshot and only fetch changes "
+    "since the last build",
+)
+parser.add_argument(
+    "--text-store",
+    metavar="DIR",
+    help="store full AOP/KE descriptions in a compressed text store and put "
+    "only snippets on the nodes",
+)
+parser.add_argument(
+    "--ontology-cache",
+    metavar="DIR",
+    default=DEFAULT_CACHE_DIR,
+    help="cache the downloaded ontology and resolved schema mapping here "
+    f"(default: {DEFAULT_CACHE_DIR})",
+)
+parser.add_argument(
+    "--no-ontology-cache",
+    action="store_true",
+    help="always download and resolve the ontology",
+)
+
+
+def build_sequential(bc, aop_kwargs):
+    adapters = [CustomAdapter(), CustomAOPAdapter(**aop_kwargs), CompoundWikiAdapter()]
+    for adapter in adapters:
+        bc.write_nodes(adapter.get_nodes())
+
+    # All edges go through a single deduplicate_edges() stream, so an edge
+    # produced by several adapters is written once and BioCypher does not
+    # need to keep its own set of edge keys.
+    replace_biocypher_edge_dedup(bc)
+    bc.write_edges(
+        deduplicate_edges(chain.from_iterable(adapter.get_edges() for adapter in adapters))
+    )
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    bc = BioCypher(schema_config_path="config/schema_config_vhp.yaml")
+    #bc.show_ontology_structure(full=True)
 
-adapter = CustomAdapter()
-bc.write_nodes(adapter.get_nodes())
-bc.write_edges(adapter.get_edges())
+    if not args.no_ontology_cache:
+        load_cached_ontology(bc, args.ontology_cache)
 
-adapter = CustomAOPAdapter()
-bc.write_nodes(adapter.get_nodes())
-bc.write_edges(adapter.get_edges())
+    aop_kwargs = {
+        "rdf_dumps": args.aopwiki_dump,
+        "snapshot_dir": args.aopwiki_snapshot,
+        "text_store_dir": args.text_store,
+    }
 
-adapter = CompoundWikiAdapter()
-bc.write_nodes(adapter.get_nodes())
-bc.write_edges(adapter.get_edges())
+    if args.pipelined:
+        build_pipelined(
+            bc,
+            [CustomAdapter, (CustomAOPAdapter, aop_kwargs), CompoundWikiAdapter],
+            use_processes=args.processes,
+        )
+    else:
+        build_sequential(bc, aop_kwargs)
 
-# Write admin import statement
-bc.write_import_call()
-bc.write_schema_info(as_node=True)
+    # Write admin import statement
+    bc.write_import_call()
+    bc.write_schema_info(as_node=True)
 
-# Print summary
-bc.summary()
+    # Print summary
+    bc.summary()
 
-# # Ontology information
-# ont = bc._get_ontology()
-# print(ont._nx_graph.nodes)
+    # # Ontology information
+    # ont = bc._get_ontology()
+    # print(ont._nx_graph.nodes)
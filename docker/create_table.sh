@@ -1,4 +1,12 @@
 sleep 15
 echo "Creating database '$BC_TABLE_NAME'"
-cypher-shell -u $NEO4J_USER -p $NEO4J_PASSWORD "create database $BC_TABLE_NAME;"
-echo "Database created!"
\ No newline at end of file
+cypher-shell -u $NEO4J_USER -p $NEO4J_PASSWORD "create database $BC_TABLE_NAME WAIT;"
+echo "Database created!"
+echo "Creating numeric indexes on experimental conditions"
+for prop in exposure_duration_hours_min exposure_duration_hours_max \
+            exposure_concentration_mg_per_l_min exposure_concentration_mg_per_l_max \
+            exposure_concentration_micromolar_min exposure_concentration_micromolar_max; do
+  cypher-shell -u $NEO4J_USER -p $NEO4J_PASSWORD -d $BC_TABLE_NAME \
+    "CREATE INDEX ${prop} IF NOT EXISTS FOR (n:ExperimentalCondition) ON (n.${prop});"
+done
+echo "Indexes created!"
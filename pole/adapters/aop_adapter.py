@@ -1,11 +1,18 @@
+import json
+import os
+import re
 import pandas as pd
 import sys
 import urllib.parse
+from collections import defaultdict
 from enum import Enum
-from itertools import chain
+from itertools import chain, product
 from typing import Optional
 from biocypher._logger import logger
 from SPARQLWrapper import SPARQLWrapper, JSON
+from pole.compact import CompactEdges, StringTable, categorize
+from pole.rdf import RDF, parse_triples
+from pole.text_store import TextStoreWriter, make_snippet
 
 logger.debug(f"Loading module {__name__}.")
 
@@ -55,6 +62,258 @@ def get_results(query):
     sparql.setReturnFormat(JSON)
     return sparql.queryAndConvert()
 
+
+AOPO = "http://aopkb.oecd.org/aopo#"
+DC = "http://purl.org/dc/elements/1.1/"
+RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+NCI = "http://ncicb.nci.nih.gov/xml/owl/EVS/Thesaurus.owl#"
+
+# Per query: the rdf:type of the subject, then (column, predicate, required)
+# for each selected variable, mirroring data/aopwiki/aop.rq and ke.rq.
+AOPWIKI_DUMP_QUERIES = {
+    "aop": (AOPO + "AdverseOutcomePathway", "AOP", [
+        ("AOPName", DC + "title", True),
+        ("AOPID", RDFS + "label", True),
+        ("MIE", AOPO + "has_molecular_initiating_event", True),
+        ("AO", AOPO + "has_adverse_outcome", True),
+        ("AOPKE", AOPO + "has_key_event", True),
+        ("AOPcreator", DC + "creator", True),
+        ("AOPStressor", NCI + "C54571", False),
+        ("AOPDescription", DC + "description", False),
+        ("AOPsource", DC + "source", True),
+    ]),
+    "ke": (AOPO + "KeyEvent", "KE", [
+        ("KEName", DC + "title", True),
+        ("KEID", RDFS + "label", True),
+        ("KEDescription", DC + "description", True),
+    ]),
+}
+
+
+def read_aopwiki_dump(paths):
+    """
+    Parse one or more local AOP-Wiki RDF dumps and return the result sets of
+    aop.rq, ke.rq and ker.rq as DataFrames keyed by query name.
+
+    The dumps are read twice. The first pass only records which subjects have
+    one of the queried types and which key events the relationships point
+    to; the second keeps the queried predicates of those subjects alone, so
+    memory follows the size of the extracted records rather than the number
+    of subjects in the dumps. rdflib labels blank nodes afresh on every
+    parse, so only IRI subjects are matched, which is how AOP-Wiki
+    identifies all of its entities. Multi-valued properties expand into one row
+    per combination, as the SPARQL endpoint returns them.
+    """
+    rdf_type = RDF + "type"
+    ke_links = {AOPO + "has_upstream_key_event", AOPO + "has_downstream_key_event"}
+    target_types = {query_type for query_type, _, _ in AOPWIKI_DUMP_QUERIES.values()}
+    target_types.add(AOPO + "KeyEventRelationship")
+
+    targets = set()
+    linked = set()
+
+    def find_targets(subject, predicate, obj):
+        if predicate == rdf_type and obj in target_types:
+            targets.add(subject)
+        elif predicate in ke_links:
+            linked.add(obj)
+
+    for path in paths:
+        parse_triples(path, find_targets)
+
+    predicates = {rdf_type} | ke_links
+    for _, _, fields in AOPWIKI_DUMP_QUERIES.values():
+        predicates.update(predicate for _, predicate, _ in fields)
+
+    values = defaultdict(lambda: defaultdict(list))
+
+    def collect(subject, predicate, obj):
+        if subject in targets:
+            if predicate in predicates:
+                values[subject][predicate].append(obj)
+        # ker.rq only needs the labels of the linked key events.
+        elif subject in linked and predicate == RDFS + "label":
+            values[subject][predicate].append(obj)
+
+    for path in paths:
+        parse_triples(path, collect)
+    logger.info(f"Kept {len(values)} subjects from the AOP-Wiki dumps.")
+
+    subjects_by_type = defaultdict(list)
+    for subject, props in values.items():
+        for rdf_type in props.get(RDF + "type", []):
+            subjects_by_type[rdf_type].append(subject)
+
+    results = {}
+    for name, (rdf_type, subject_column, fields) in AOPWIKI_DUMP_QUERIES.items():
+        columns = [subject_column] + [column for column, _, _ in fields]
+        rows = []
+        for subject in subjects_by_type[rdf_type]:
+            props = values[subject]
+            if any(required and not props.get(predicate) for _, predicate, required in fields):
+                continue
+            choices = [props.get(predicate) or [None] for _, predicate, _ in fields]
+            rows.extend([subject, *combination] for combination in product(*choices))
+        results[name] = pd.DataFrame(rows, columns=columns)
+
+    # ker.rq joins each relationship to the labels of its key events.
+    rows = []
+    for subject in subjects_by_type[AOPO + "KeyEventRelationship"]:
+        props = values[subject]
+        for up, down in product(
+            props.get(AOPO + "has_upstream_key_event", []),
+            props.get(AOPO + "has_downstream_key_event", []),
+        ):
+            for up_id, down_id in product(
+                values[up].get(RDFS + "label", []) if up in values else [],
+                values[down].get(RDFS + "label", []) if down in values else [],
+            ):
+                rows.append([subject, up_id, down_id])
+    results["ker"] = pd.DataFrame(rows, columns=["KER", "KEupID", "KEdownID"])
+
+    return results
+
+# Per query: the subject column identifying an entity, and its rdf:type.
+AOPWIKI_ENTITIES = {
+    "aop": ("AOP", "aopo:AdverseOutcomePathway"),
+    "ke": ("KE", "aopo:KeyEvent"),
+    "ker": ("KER", "aopo:KeyEventRelationship"),
+}
+
+SYNC_PREFIXES = "PREFIX dcterms: <http://purl.org/dc/terms/>\n"
+# Entity IRIs per VALUES clause when fetching entities by ID.
+ENTITY_BATCH_SIZE = 200
+
+
+def _watermark_query():
+    types = " ".join(rdf_type for _, rdf_type in AOPWIKI_ENTITIES.values())
+    return f"""{SYNC_PREFIXES}SELECT (MAX(STR(?modified)) AS ?latest)
+WHERE {{
+ VALUES ?type {{ {types} }}
+ ?entity a ?type ; dcterms:modified ?modified .
+}}"""
+
+
+def _delta_query(query, subject_column, since):
+    # Modification dates are compared lexically so xsd:date and xsd:dateTime
+    # values both work. ">=" re-fetches entities sharing the watermark
+    # timestamp, which the merge simply replaces.
+    return f"""{SYNC_PREFIXES}SELECT *
+WHERE {{
+ {{ {query} }}
+ ?{subject_column} dcterms:modified ?modified .
+ FILTER(STR(?modified) >= "{since}")
+}}"""
+
+
+def _ids_query(rdf_type):
+    return f"SELECT ?id WHERE {{ ?id a {rdf_type} }}"
+
+
+def _entities_query(query, subject_column, ids):
+    values = " ".join(f"<{entity}>" for entity in ids)
+    return f"""SELECT *
+WHERE {{
+ {{ {query} }}
+ VALUES ?{subject_column} {{ {values} }}
+}}"""
+
+
+def _fetch_entities(query, subject_column, ids):
+    """
+    Fetch the result rows of a query for the given entity IRIs, a batch of
+    IRIs per request.
+    """
+    frames = [
+        sparql_json_to_dataframe(
+            get_results(
+                _entities_query(query, subject_column, ids[start:start + ENTITY_BATCH_SIZE])
+            )
+        )
+        for start in range(0, len(ids), ENTITY_BATCH_SIZE)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def sync_aopwiki_snapshot(snapshot_dir):
+    """
+    Bring a local snapshot of the aop.rq, ke.rq and ker.rq result sets up to
+    date and return them as DataFrames keyed by query name.
+
+    The first run fetches everything and records the newest dcterms:modified
+    value on the endpoint as watermark. Later runs only fetch entities
+    modified at or after the watermark, replace their rows in the snapshot,
+    and drop entities whose IRI no longer appears in a cheap ID-set query.
+    IRIs in that ID set which are neither in the snapshot nor in the changes
+    (no modification date, or one older than the watermark) are fetched by
+    ID.
+    The watermark comes from the endpoint's own data rather than the local
+    clock, so releases published after the last sync are not missed.
+    """
+    sync_path = os.path.join(snapshot_dir, "sync.json")
+    watermark = None
+    if os.path.exists(sync_path):
+        with open(sync_path, "r", encoding="utf-8") as file:
+            watermark = json.load(file).get("watermark")
+
+    results = {}
+    if watermark is None:
+        logger.info("No usable AOP-Wiki snapshot, fetching full result sets.")
+        latest = sparql_json_to_dataframe(get_results(_watermark_query()))["latest"]
+        new_watermark = latest.iloc[0] if len(latest) else None
+        for name in AOPWIKI_ENTITIES:
+            query = read_file_to_string(f"data/aopwiki/{name}.rq")
+            results[name] = sparql_json_to_dataframe(get_results(query))
+    else:
+        logger.info(f"Fetching AOP-Wiki changes since {watermark}.")
+        new_watermark = watermark
+        for name, (subject_column, rdf_type) in AOPWIKI_ENTITIES.items():
+            snapshot = pd.read_pickle(os.path.join(snapshot_dir, f"{name}.pkl"))
+            query = read_file_to_string(f"data/aopwiki/{name}.rq")
+            delta = sparql_json_to_dataframe(
+                get_results(_delta_query(query, subject_column, watermark))
+            )
+            ids = sparql_json_to_dataframe(get_results(_ids_query(rdf_type)))["id"]
+
+            if len(delta):
+                new_watermark = max(new_watermark, delta["modified"].max())
+
+            # Entities without dcterms:modified, or dated before the
+            # watermark, are not in the delta. Fetch any that are not in the
+            # snapshot either by ID.
+            missing = ids[
+                ~ids.isin(snapshot[subject_column]) & ~ids.isin(delta[subject_column])
+            ].unique().tolist()
+            if missing:
+                logger.info(f"{name}: fetching {len(missing)} entities missing from the snapshot.")
+                delta = pd.concat(
+                    [delta, _fetch_entities(query, subject_column, missing)],
+                    ignore_index=True,
+                )
+
+            changed = snapshot[subject_column].isin(delta[subject_column])
+            deleted = ~snapshot[subject_column].isin(ids)
+            logger.info(
+                f"{name}: {delta[subject_column].nunique()} changed or new entities, "
+                f"{snapshot.loc[deleted, subject_column].nunique()} deleted entities."
+            )
+            results[name] = pd.concat(
+                [snapshot[~changed & ~deleted], delta[snapshot.columns]],
+                ignore_index=True,
+            )
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    for name, data in results.items():
+        data.to_pickle(os.path.join(snapshot_dir, f"{name}.pkl"))
+    # Written last, so an interrupted sync is retried from the old watermark.
+    with open(sync_path, "w", encoding="utf-8") as file:
+        json.dump({"watermark": new_watermark}, file)
+    if new_watermark is None:
+        logger.warning("AOP-Wiki has no dcterms:modified dates, next sync will be a full fetch.")
+
+    return results
+
+
 class CustomAdapterNodeType(Enum):
     """
     Define types of nodes the adapter can provide.
@@ -93,38 +352,132 @@ class CustomAdapterEdgeType(Enum):
     KEY_EVENT_RELATIONSHIP = "key_event_relationship"  # New edge type
 
 
+# Column of aop.rq holding the end node of each AOP edge type.
+AOP_EDGE_COLUMNS = {
+    CustomAdapterEdgeType.AOP_INCLUDES_MIE: "MIE",
+    CustomAdapterEdgeType.AOP_INCLUDES_AO: "AO",
+    CustomAdapterEdgeType.AOP_INCLUDES_KEY_EVENT: "AOPKE",
+    CustomAdapterEdgeType.AOP_RELEVANT_STRESSOR: "AOPStressor",
+}
+
+
 class CustomAOPAdapter:
     """
     Adapter for creating a knowledge graph
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        node_types: Optional[list] = None,
+        node_fields: Optional[list] = None,
+        edge_types: Optional[list] = None,
+        edge_fields: Optional[list] = None,
+        rdf_dumps: Optional[list] = None,
+        snapshot_dir: Optional[str] = None,
+        text_store_dir: Optional[str] = None,
+    ):
         """
         Initialize with three input files: AOP file, KE file, and Key Event Relationship file.
+        These come from the AOP-Wiki SPARQL endpoint, or from local AOP-Wiki RDF dumps
+        (RDF/XML, N-Triples or Turtle, optionally gzipped) if rdf_dumps is given. With
+        snapshot_dir, endpoint results are kept in a local snapshot that is updated
+        incrementally from modification dates. With text_store_dir, full AOP and KE
+        descriptions go to a compressed text store there and nodes only carry a snippet.
+
+        Queries not needed for the selected node and edge types are skipped, and
+        endpoint queries only project the variables the selected fields need.
         """
-        self._node_data, self._edge_data = self._read_and_format_aop_csv()  # Read AOP data
-        self._ke_data = self._read_ke_csv()  # Read KE data
-        self._ke_relationship_data = self._read_ke_relationship_csv()  # Read Key Event Relationship data
+        self._set_types_and_fields(node_types, node_fields, edge_types, edge_fields)
+        self._text_store_dir = text_store_dir
+        if rdf_dumps:
+            self._results = read_aopwiki_dump(rdf_dumps)
+        elif snapshot_dir:
+            self._results = sync_aopwiki_snapshot(snapshot_dir)
+        else:
+            self._results = None
+        # IDs and IRIs shared by all edge lists are interned once
+        self._strings = StringTable()
+        self._aop_edge_types = [
+            edge_type for edge_type in AOP_EDGE_COLUMNS if edge_type.value in self.edge_types
+        ]
+
+        if CustomAdapterNodeType.AOP.value in self.node_types or self._aop_edge_types:
+            self._node_data, self._edge_data = self._read_and_format_aop_csv()  # Read AOP data
+        else:
+            logger.info("Skipping aop.rq, no AOP nodes or edges requested.")
+            self._node_data = pd.DataFrame(columns=["AOPID", "_labels"])
+            self._edge_data = CompactEdges(self._strings)
+
+        if CustomAdapterNodeType.KEY_EVENT.value in self.node_types:
+            self._ke_data = self._read_ke_csv()  # Read KE data
+        else:
+            logger.info("Skipping ke.rq, no KeyEvent nodes requested.")
+            self._ke_data = pd.DataFrame(columns=["KEID"])
+
+        if CustomAdapterEdgeType.KEY_EVENT_RELATIONSHIP.value in self.edge_types:
+            ke_relationship_data = self._read_ke_relationship_csv()  # Read Key Event Relationship data
+        else:
+            logger.info("Skipping ker.rq, no key event relationships requested.")
+            ke_relationship_data = pd.DataFrame(columns=["KEupID", "KEdownID"])
+        self._ke_relationship_data = CompactEdges(self._strings)
+        self._ke_relationship_data.extend(
+            ke_relationship_data["KEupID"],
+            ke_relationship_data["KEdownID"],
+            CustomAdapterEdgeType.KEY_EVENT_RELATIONSHIP.value,
+        )
 
         # Check if '_labels' column exists, if not, assume a default label
         if '_labels' not in self._node_data.columns:
             logger.warning(f"'_labels' column not found, assigning default label ':AOP' for all nodes.")
             self._node_data['_labels'] = ':AOP'
+        self._node_data = categorize(self._node_data, ["_labels"])
+        # Release result sets of skipped queries as well
+        if self._results is not None:
+            self._results.clear()
 
         # Print unique _labels and _types for debugging
         print(f"Unique labels: {self._node_data['_labels'].unique()}")
-        print(f"Unique types: {self._edge_data['_type'].unique()}")
+        print(f"Unique types: {self._edge_data.type_names}")
 
+    def _query(self, name, variables=None):
+        """
+        Return the result set of data/aopwiki/<name>.rq as a DataFrame, from
+        the RDF dumps or snapshot if given, otherwise from the SPARQL endpoint.
+        If variables is given, the endpoint query only projects those.
+        """
+        if self._results is not None:
+            logger.info(f"Using {name}.rq results from the local RDF dumps or snapshot.")
+            # Handed over, not kept: the caller reduces it and drops it
+            return self._results.pop(name)
+
+        logger.info(f"Running {name}.rq against the SPARQL endpoint.")
+        query = read_file_to_string(f"data/aopwiki/{name}.rq")
+        if variables:
+            projection = " ".join(f"?{variable}" for variable in variables)
+            query = re.sub(r"^SELECT .*$", f"SELECT {projection}", query, count=1, flags=re.M)
+        results = get_results(query)
+        return sparql_json_to_dataframe(results)
+
+    def _selected_fields(self, field_enum):
+        """
+        Return the selected fields of one field enum. Descriptions are only
+        needed when they are kept in a text store.
+        """
+        return [
+            field.value
+            for field in field_enum
+            if field.value in self.node_fields
+            and (field.name != "DESCRIPTION" or self._text_store_dir)
+        ]
 
     def _read_ke_csv(self):
         """
         Read Key Event (KE) data from the KE CSV file.
         """
-        logger.info(f"Reading Key Event (KE) data from the SPARQL endpoint.")
+        logger.info(f"Reading Key Event (KE) data.")
 
-        query = read_file_to_string("data/aopwiki/ke.rq")
-        results = get_results(query)
-        ke_data = sparql_json_to_dataframe(results)
+        variables = ["KEID"] + self._selected_fields(CustomAdapterKEField)
+        ke_data = self._query("ke", list(dict.fromkeys(variables)))
 
         # Ensure the necessary columns exist in the KE data
         if 'KEID' not in ke_data.columns:
@@ -137,11 +490,9 @@ class CustomAOPAdapter:
         """
         Read Key Event Relationship (KEupID -> KEdownID) data from the Key Event Relationship CSV file.
         """
-        logger.info(f"Reading Key Event Relationship data from the SPARQL endpoint.")
+        logger.info(f"Reading Key Event Relationship data.")
 
-        query = read_file_to_string("data/aopwiki/ker.rq")
-        results = get_results(query)
-        ke_relationship_data = sparql_json_to_dataframe(results)
+        ke_relationship_data = self._query("ker")
 
         # Ensure the necessary columns exist in the Key Event Relationship data
         if 'KEupID' not in ke_relationship_data.columns or 'KEdownID' not in ke_relationship_data.columns:
@@ -152,12 +503,16 @@ class CustomAOPAdapter:
     def _read_and_format_aop_csv(self):
         """
         Read and format data from the AOP CSV file, adding edges and cleaning types.
+        The query returns one row per combination of multi-valued properties;
+        nodes are reduced to one row per AOP and edges to integer-encoded
+        arrays, after which the query result is released.
         """
-        logger.info(f"Reading and formatting data from the SPARQL endpoint.")
+        logger.info(f"Reading and formatting AOP data.")
 
-        query = read_file_to_string("data/aopwiki/aop.rq")
-        results = get_results(query)
-        data = sparql_json_to_dataframe(results)
+        variables = ["AOPID"] + [AOP_EDGE_COLUMNS[edge_type] for edge_type in self._aop_edge_types]
+        if CustomAdapterNodeType.AOP.value in self.node_types:
+            variables += self._selected_fields(CustomAdapterAOPField)
+        data = self._query("aop", list(dict.fromkeys(variables)))
 
         # Check if _type column exists, if not, handle nodes and edges separately
         if "_type" not in data.columns:
@@ -168,36 +523,21 @@ class CustomAOPAdapter:
         if "_type" in data.columns:
             data["_type"] = data["_type"].str.strip()
 
-        # Create edges based on related columns (MIE, AO, AOPKE, and AOPStressor)
-        # MIE edge
-        mie_edges = data[["AOPID", "MIE"]].dropna().copy()
-        mie_edges["_start"] = mie_edges["AOPID"]
-        mie_edges["_end"] = mie_edges["MIE"]
-        mie_edges["_type"] = "AOP_includes_mie"
-
-        # AO edge
-        ao_edges = data[["AOPID", "AO"]].dropna().copy()
-        ao_edges["_start"] = ao_edges["AOPID"]
-        ao_edges["_end"] = ao_edges["AO"]
-        ao_edges["_type"] = "AOP_includes_ao"
-
-        # AOPKE edge (Key Event)
-        key_event_edges = data[["AOPID", "AOPKE"]].dropna().copy()
-        key_event_edges["_start"] = key_event_edges["AOPID"]
-        key_event_edges["_end"] = key_event_edges["AOPKE"]
-        key_event_edges["_type"] = "AOP_includes_key_event"
-
-        # AOPStressor edge
-        stressor_edges = data[["AOPID", "AOPStressor"]].dropna().copy()
-        stressor_edges["_start"] = stressor_edges["AOPID"]
-        stressor_edges["_end"] = stressor_edges["AOPStressor"]
-        stressor_edges["_type"] = "AOP_relevant_stressor"
-
-        # Combine all edge data into one dataframe
-        edges = pd.concat([mie_edges, ao_edges, key_event_edges, stressor_edges], ignore_index=True)
+        # Create edges based on related columns (MIE, AO, AOPKE, and AOPStressor),
+        # for the selected edge types only
+        edges = CompactEdges(self._strings)
+        for edge_type in self._aop_edge_types:
+            column = AOP_EDGE_COLUMNS[edge_type]
+            type_edges = data[["AOPID", column]].dropna()
+            edges.extend(type_edges["AOPID"], type_edges[column], edge_type.value)
+
+        # Keep one row per AOP with the node columns only
+        edge_columns = ["_type"] + [AOP_EDGE_COLUMNS[edge_type] for edge_type in AOP_EDGE_COLUMNS]
+        nodes = data.drop(columns=edge_columns, errors="ignore").drop_duplicates(subset="AOPID")
+        del data
 
         # Return formatted data and edges as separate datasets
-        return data, edges
+        return nodes, edges
 
 
     def get_nodes(self):
@@ -207,29 +547,60 @@ class CustomAOPAdapter:
         """
         logger.info("Generating nodes.")
 
-        # First, yield the AOP nodes
-        for index, row in self._node_data.iterrows():
-            _id = row.get("AOPID", None)
-            _type = row.get("_labels", ":AOP")
-            _props = {
-                'name': row.get('AOPName', None),
-                'creator': row.get('AOPcreator', None),
-                #'description': row.get('AOPDescription', None),
-                'source': row.get('AOPsource', None)
-            }
-            #logger.info(f"Yielding AOP node: ID={_id}, Type={_type}, Properties={_props}")
-            yield (_id, _type, _props)
-
-        # Then, yield the KE nodes
-        for index, row in self._ke_data.iterrows():
-            _id = row.get("KEID", None)
-            _type = ":KeyEvent"  # Default label for Key Event nodes
-            _props = {
-                'name': row.get('KEName', None),
-                #'description': row.get('KEDescription', None)
-            }
-            #logger.info(f"Yielding KE node: ID={_id}, Type={_type}, Properties={_props}")
-            yield (_id, _type, _props)
+        text_store = None
+        if self._text_store_dir:
+            text_store = TextStoreWriter(
+                os.path.join(self._text_store_dir, "aopwiki_descriptions")
+            )
+
+        try:
+            # First, yield the AOP nodes (aop.rq may also be read for edges only)
+            aop_data = self._node_data
+            if CustomAdapterNodeType.AOP.value not in self.node_types:
+                aop_data = aop_data.iloc[0:0]
+            for index, row in aop_data.iterrows():
+                _id = row.get("AOPID", None)
+                _type = row.get("_labels", ":AOP")
+                _props = {
+                    'name': row.get('AOPName', None),
+                    'creator': row.get('AOPcreator', None),
+                    #'description': row.get('AOPDescription', None),
+                    'source': row.get('AOPsource', None)
+                }
+                if text_store is not None:
+                    self._add_description(_props, text_store, _id, row.get('AOPDescription', None))
+                #logger.info(f"Yielding AOP node: ID={_id}, Type={_type}, Properties={_props}")
+                yield (_id, _type, _props)
+
+            # Then, yield the KE nodes
+            for index, row in self._ke_data.iterrows():
+                _id = row.get("KEID", None)
+                _type = ":KeyEvent"  # Default label for Key Event nodes
+                _props = {
+                    'name': row.get('KEName', None),
+                    #'description': row.get('KEDescription', None)
+                }
+                if text_store is not None:
+                    self._add_description(_props, text_store, _id, row.get('KEDescription', None))
+                #logger.info(f"Yielding KE node: ID={_id}, Type={_type}, Properties={_props}")
+                yield (_id, _type, _props)
+        finally:
+            if text_store is not None:
+                text_store.close()
+
+    @staticmethod
+    def _add_description(props, text_store, node_id, description):
+        """
+        Store the full description out of line under the node ID and put a
+        short snippet on the node instead.
+        """
+        if not isinstance(description, str) or not description:
+            return
+        snippet = make_snippet(description)
+        props['description'] = snippet
+        props['description_truncated'] = snippet != description
+        if snippet != description:
+            text_store.put(node_id, description)
 
 
     def get_edges(self):
@@ -239,25 +610,42 @@ class CustomAOPAdapter:
         """
         logger.info("Generating edges.")
 
-        # First, yield AOP-related edges
-        for index, row in self._edge_data.iterrows():
-            _id = None  # Edge ID can be auto-generated or skipped
-            _start = row["_start"]
-            _end = row["_end"]
-            _type = row["_type"]
-            _props = {}
-
+        # First, yield AOP-related edges (_id is None, edge ID can be auto-generated or skipped)
+        for _id, _start, _end, _type, _props in self._edge_data:
             #logger.info(f"Yielding edge: Start={_start}, End={_end}, Type={_type}, Properties={_props}")
             yield (_id, _start, _end, _type, _props)
 
         # Then, yield the Key Event Relationship edges
-        for index, row in self._ke_relationship_data.iterrows():
-            _id = None  # Edge ID can be auto-generated or skipped
-            _start = row["KEupID"]
-            _end = row["KEdownID"]
-            _type = "key_event_relationship"
-            _props = {}
-
+        for _id, _start, _end, _type, _props in self._ke_relationship_data:
             #logger.info(f"Yielding Key Event Relationship edge: Start={_start}, End={_end}, Type={_type}")
             yield (_id, _start, _end, _type, _props)
 
+    def _set_types_and_fields(self, node_types, node_fields, edge_types, edge_fields):
+        """
+        Set the types and fields for nodes and edges, if specified. Otherwise, use defaults.
+        """
+        if node_types:
+            self.node_types = [type.value for type in node_types]
+        else:
+            self.node_types = [type.value for type in CustomAdapterNodeType]
+
+        if node_fields:
+            self.node_fields = [field.value for field in node_fields]
+        else:
+            self.node_fields = [
+                field.value
+                for field in chain(
+                    CustomAdapterAOPField,
+                    CustomAdapterKEField,
+                )
+            ]
+
+        if edge_types:
+            self.edge_types = [type.value for type in edge_types]
+        else:
+            self.edge_types = [type.value for type in CustomAdapterEdgeType]
+
+        if edge_fields:
+            self.edge_fields = [field.value for field in edge_fields]
+        else:
+            self.edge_fields = []
@@ -3,6 +3,9 @@ from enum import Enum
 from itertools import chain
 from typing import Optional
 from biocypher._logger import logger
+from pole.compact import CompactEdges, categorize
+from pole.csv_reader import read_csv_selected
+from pole.units import parse_concentration, parse_duration_hours
 
 logger.debug(f"Loading module {__name__}.")
 
@@ -73,12 +76,43 @@ class CustomAdapterExperimentalConditionField(Enum):
     EXPOSURE_CONCENTRATION = "exposure_concentration"
     CONDITION_NAME = "condition_name"
     DESCRIPTION = "ExperimentalConditionDescription"
+    EXPOSURE_DURATION_HOURS_MIN = "exposure_duration_hours_min"
+    EXPOSURE_DURATION_HOURS_MAX = "exposure_duration_hours_max"
+    EXPOSURE_CONCENTRATION_MG_PER_L_MIN = "exposure_concentration_mg_per_l_min"
+    EXPOSURE_CONCENTRATION_MG_PER_L_MAX = "exposure_concentration_mg_per_l_max"
+    EXPOSURE_CONCENTRATION_MICROMOLAR_MIN = "exposure_concentration_micromolar_min"
+    EXPOSURE_CONCENTRATION_MICROMOLAR_MAX = "exposure_concentration_micromolar_max"
+
+# Numeric properties derived from exposure_duration and exposure_concentration.
+EXPERIMENTAL_CONDITION_NUMERIC_FIELDS = [
+    CustomAdapterExperimentalConditionField.EXPOSURE_DURATION_HOURS_MIN,
+    CustomAdapterExperimentalConditionField.EXPOSURE_DURATION_HOURS_MAX,
+    CustomAdapterExperimentalConditionField.EXPOSURE_CONCENTRATION_MG_PER_L_MIN,
+    CustomAdapterExperimentalConditionField.EXPOSURE_CONCENTRATION_MG_PER_L_MAX,
+    CustomAdapterExperimentalConditionField.EXPOSURE_CONCENTRATION_MICROMOLAR_MIN,
+    CustomAdapterExperimentalConditionField.EXPOSURE_CONCENTRATION_MICROMOLAR_MAX,
+]
 
 class CustomAdapterMeasurableEndpointField(Enum):
     NAME = "MeasurableEndpointName"
     DESCRIPTION = "MeasurableEndpointDescription"
     TYPE = "MeasurableEndpointType"
 
+# Fields read for each node type; only those of selected types are loaded.
+NODE_TYPE_FIELDS = {
+    CustomAdapterNodeType.CASESTUDY: CustomAdapterCaseStudyField,
+    CustomAdapterNodeType.ORGAN: CustomAdapterOrganField,
+    CustomAdapterNodeType.CHEMICAL: CustomAdapterChemicalField,
+    CustomAdapterNodeType.MODEL_SYSTEM: CustomAdapterModelSystemField,
+    CustomAdapterNodeType.COMPUTATIONAL_MODEL: CustomAdapterComputationalModelField,
+    CustomAdapterNodeType.BIOASSAY: CustomAdapterBioassayField,
+    CustomAdapterNodeType.EXPERIMENTAL_CONDITION: CustomAdapterExperimentalConditionField,
+    CustomAdapterNodeType.MEASURABLE_ENDPOINT: CustomAdapterMeasurableEndpointField,
+}
+
+# Columns every node and edge row needs.
+BASE_COLUMNS = ["_id", "_labels", "_start", "_end", "_type"]
+
 
 class CustomAdapterEdgeType(Enum):
     """
@@ -114,36 +148,92 @@ class CustomAdapter:
     ):
         self._set_types_and_fields(node_types, node_fields, edge_types, edge_fields)
         self._data = self._read_csv()
-        self._node_data = self._get_node_data()
-        self._edge_data = self._get_edge_data()
 
         # Print unique _labels and _types for debugging
         print(f"Unique labels: {self._data['_labels'].unique()}")
         print(f"Unique types: {self._data['_type'].unique()}")
 
+        self._node_data = self._get_node_data()
+        self._edge_data = self._get_edge_data()
+
+        # The source frame is fully split into node and edge data; release it.
+        self._data = None
+
     def _read_csv(self):
         """
-        Read data from CSV file and clean edge type column.
+        Read data from CSV file and clean edge type column. Only the columns
+        of the selected node fields are read, and rows of unselected node or
+        edge types are dropped chunk by chunk.
         """
         logger.info("Reading data from CSV file.")
-        data = pd.read_csv("data/Combined_output.csv", dtype=str)
+
+        def selected_rows(chunk):
+            edge_type = chunk["_type"].str.strip()
+            is_node = edge_type.isnull() & chunk["_labels"].isin(self.node_types)
+            return is_node | edge_type.isin(self.edge_types)
+
+        data = read_csv_selected(
+            "data/Combined_output.csv", self._selected_columns(), selected_rows
+        )
 
         # Clean whitespace from the _type column to avoid issues
         data["_type"] = data["_type"].str.strip()
 
         return data
 
+    def _selected_columns(self):
+        """
+        Return the CSV columns needed for the selected node types and fields.
+        """
+        columns = list(BASE_COLUMNS)
+        for node_type, field_enum in NODE_TYPE_FIELDS.items():
+            if node_type.value in self.node_types:
+                columns += [field.value for field in field_enum if field.value in self.node_fields]
+
+        # The numeric condition fields are parsed from the raw strings.
+        if any(field.value in self.node_fields for field in EXPERIMENTAL_CONDITION_NUMERIC_FIELDS):
+            columns += [
+                CustomAdapterExperimentalConditionField.EXPOSURE_DURATION.value,
+                CustomAdapterExperimentalConditionField.EXPOSURE_CONCENTRATION.value,
+            ]
+        return columns
+
     def _get_node_data(self):
         """
-        Get all rows that do not have a _type (i.e., nodes).
+        Get all rows that do not have a _type (i.e., nodes), with numeric
+        experimental-condition properties added. Edge-only columns are
+        dropped and labels are stored as a categorical.
         """
-        return self._data[self._data["_type"].isnull()]
+        node_data = self._data[self._data["_type"].isnull()]
+        node_data = node_data.drop(columns=["_start", "_end", "_type"], errors="ignore")
+        node_data = categorize(node_data, ["_labels"])
+        return self._add_experimental_condition_numbers(node_data)
+
+    def _add_experimental_condition_numbers(self, node_data):
+        """
+        Parse exposure_duration and exposure_concentration into normalized
+        numeric columns (hours, mg/L, micromolar) for the whole frame at once.
+        Rows that are not experimental conditions or cannot be parsed get NaN.
+        """
+        conditions = node_data["_labels"] == CustomAdapterNodeType.EXPERIMENTAL_CONDITION.value
+        numbers = []
+        if "exposure_duration" in node_data.columns:
+            numbers.append(parse_duration_hours(node_data.loc[conditions, "exposure_duration"]))
+        if "exposure_concentration" in node_data.columns:
+            numbers.append(parse_concentration(node_data.loc[conditions, "exposure_concentration"]))
+        if not numbers:
+            return node_data
+        return node_data.join(pd.concat(numbers, axis=1))
 
     def _get_edge_data(self):
         """
-        Get all rows that have a _type (i.e., edges).
+        Get all rows that have a _type (i.e., edges), as integer-encoded
+        endpoint arrays instead of DataFrame rows.
         """
-        return self._data[self._data["_type"].notnull()]
+        edge_rows = self._data[self._data["_type"].notnull()]
+        edge_data = CompactEdges()
+        edge_data.extend(edge_rows["_start"], edge_rows["_end"], edge_rows["_type"])
+        return edge_data
 
     def get_nodes(self):
         """
@@ -191,6 +281,9 @@ class CustomAdapter:
                 _props['exposure_concentration']= row.get('exposure_concentration', None)
                 _props['condition_name']= row.get('condition_name', None)
                 _props['description']= row.get('ExperimentalConditionDescription', None)
+                for field in EXPERIMENTAL_CONDITION_NUMERIC_FIELDS:
+                    value = row.get(field.value, None)
+                    _props[field.value] = float(value) if pd.notna(value) else None
             elif _type == ':Measurable_endpoint':
                 _props['name'] = row.get('MeasurableEndpointName', None)  # Should match the CSV field name
                 _props['description'] = row.get('MeasurableEndpointDescription', None)  # Should match the CSV field name
@@ -212,20 +305,15 @@ class CustomAdapter:
         logger.info("Generating edges.")
 
         edge_count = 0
-        for index, row in self._edge_data.iterrows():
-            # Log the row to check if it has the expected edge data
-            logger.debug(f"Processing row: {row}")
+        for _id, _start, _end, _type, _props in self._edge_data:
+            # _id is None, edges don't necessarily need unique IDs
+            # Log the edge to check if it has the expected edge data
+            logger.debug(f"Processing edge: Start={_start}, End={_end}, Type={_type}")
 
-            if row["_type"] not in self.edge_types:
-                logger.warning(f"Edge type {row['_type']} not in specified edge types. Skipping.")
+            if _type not in self.edge_types:
+                logger.warning(f"Edge type {_type} not in specified edge types. Skipping.")
                 continue
 
-            _id = None  # Edges don't necessarily need unique IDs
-            _start = str(row["_start"]) if pd.notna(row["_start"]) else None
-            _end = str(row["_end"]) if pd.notna(row["_end"]) else None
-            _type = row["_type"]
-            _props = {}
-
             if not _start or not _end:
                 logger.warning(f"Skipping edge due to missing start or end: Start={_start}, End={_end}, Type={_type}")
                 continue
@@ -3,6 +3,7 @@ from enum import Enum
 from itertools import chain
 from typing import Optional
 from biocypher._logger import logger
+from pole.csv_reader import read_csv_selected
 
 logger.debug(f"Loading module {__name__}.")
 
@@ -51,8 +52,16 @@ class CompoundWikiAdapter:
         logger.info("Generating nodes.")
 
         node_count = 0
-        data = pd.read_csv("data/CompoundWiki.csv", dtype=str)
-        data = data.map(lambda x: x.replace("'", "") if isinstance(x, str) else x) #FIXME
+        if CompoundWikiAdapterNodeType.CHEMICAL.value in self.node_types:
+            columns = ["id", "labels"] + [
+                field.value for field in CompoundWikiAdapterChemicalField
+                if field.value in self.node_fields
+            ]
+            data = read_csv_selected("data/CompoundWiki.csv", columns, self._node_rows)
+            data = data.map(lambda x: x.replace("'", "") if isinstance(x, str) else x) #FIXME
+        else:
+            logger.info("Skipping data/CompoundWiki.csv, no :Chemical nodes requested.")
+            data = pd.DataFrame(columns=["id", "labels"])
         for index, row in data.iterrows():
             _id = row["id"]
             _type = row["labels"]
@@ -72,7 +81,13 @@ class CompoundWikiAdapter:
             node_count += 1
             yield (_id, _type, _props)
 
-        data = pd.read_csv("data/CompoundWiki_webpages.csv", dtype=str)
+        if CompoundWikiAdapterNodeType.WEBPAGE.value in self.node_types:
+            data = read_csv_selected(
+                "data/CompoundWiki_webpages.csv", ["id", "labels"], self._node_rows
+            )
+        else:
+            logger.info("Skipping data/CompoundWiki_webpages.csv, no :WebPage nodes requested.")
+            data = pd.DataFrame(columns=["id", "labels"])
         for index, row in data.iterrows():
             _id = row["id"]
             _type = row["labels"]
@@ -99,7 +114,11 @@ class CompoundWikiAdapter:
         logger.info("Generating edges.")
 
         edge_count = 0
-        data = pd.read_csv("data/CompoundWiki_edges.csv", dtype=str)
+        data = read_csv_selected(
+            "data/CompoundWiki_edges.csv",
+            ["start", "end", "type"],
+            lambda chunk: chunk["type"].isin(self.edge_types),
+        )
         for index, row in data.iterrows():
             if row["type"] not in self.edge_types:
                 logger.warning(f"Edge type {row['type']} not in specified edge types.")
@@ -116,6 +135,12 @@ class CompoundWikiAdapter:
 
         logger.info(f"Total edges generated: {edge_count}")
 
+    def _node_rows(self, chunk):
+        """
+        Row mask for node CSV chunks: keep only the selected labels.
+        """
+        return chunk["labels"].isin(self.node_types)
+
     def _set_types_and_fields(self, node_types, node_fields, edge_types, edge_fields):
         """
         Set the types and fields for nodes and edges, if specified. Otherwise, use defaults.
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+MISSING = -1
+
+# Edges converted to Python objects at a time while iterating.
+ITER_CHUNK_SIZE = 65_536
+
+
+class StringTable:
+    """
+    Interning dictionary mapping each distinct string (IDs, IRIs) to a dense
+    integer code, so repeated values are stored once and referenced by code.
+    """
+
+    __slots__ = ("_codes", "_strings")
+
+    def __init__(self):
+        self._codes = {}
+        self._strings = []
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, value) -> int:
+        """
+        Return the code of a string, adding it to the table if new.
+        """
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._codes[value] = code
+            self._strings.append(value)
+        return code
+
+    def lookup(self, code):
+        """
+        Return the string for a code, or None for MISSING.
+        """
+        return None if code == MISSING else self._strings[code]
+
+    def encode(self, values: pd.Series) -> np.ndarray:
+        """
+        Encode a column as an int32 array of codes, with MISSING for NA. Each
+        distinct value is interned once, however often it repeats.
+        """
+        codes, uniques = pd.factorize(values)
+        mapping = np.fromiter(
+            (self.intern(str(value)) for value in uniques),
+            dtype=np.int32,
+            count=len(uniques),
+        )
+        encoded = np.full(len(codes), MISSING, dtype=np.int32)
+        present = codes >= 0
+        encoded[present] = mapping[codes[present]]
+        return encoded
+
+
+class CompactEdges:
+    """
+    Edge list held as integer-encoded start/end arrays over a StringTable and
+    small integer codes for the edge types, instead of DataFrame rows of
+    Python strings. Iterating yields BioCypher edge tuples.
+    """
+
+    __slots__ = ("strings", "starts", "ends", "types", "type_names")
+
+    def __init__(self, strings: StringTable = None):
+        self.strings = strings if strings is not None else StringTable()
+        self.starts = np.empty(0, dtype=np.int32)
+        self.ends = np.empty(0, dtype=np.int32)
+        self.types = np.empty(0, dtype=np.int16)
+        self.type_names = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _type_code(self, edge_type):
+        if edge_type not in self.type_names:
+            self.type_names.append(edge_type)
+        return self.type_names.index(edge_type)
+
+    def extend(self, starts: pd.Series, ends: pd.Series, types):
+        """
+        Append edges from two endpoint columns and either a single edge type
+        or a column of edge types.
+        """
+        if len(starts) == 0:
+            return
+        if isinstance(types, str):
+            type_codes = np.full(len(starts), self._type_code(types), dtype=np.int16)
+        else:
+            codes, uniques = pd.factorize(types)
+            mapping = np.array([self._type_code(str(name)) for name in uniques], dtype=np.int16)
+            type_codes = mapping[codes]
+
+        self.starts = np.concatenate([self.starts, self.strings.encode(starts)])
+        self.ends = np.concatenate([self.ends, self.strings.encode(ends)])
+        self.types = np.concatenate([self.types, type_codes])
+
+    def __iter__(self):
+        # Convert slice by slice, tolist() on the whole arrays would hold a
+        # Python int per code for every edge at once.
+        lookup = self.strings.lookup
+        for offset in range(0, len(self), ITER_CHUNK_SIZE):
+            chunk = slice(offset, offset + ITER_CHUNK_SIZE)
+            for start, end, edge_type in zip(
+                self.starts[chunk].tolist(),
+                self.ends[chunk].tolist(),
+                self.types[chunk].tolist(),
+            ):
+                yield (None, lookup(start), lookup(end), self.type_names[edge_type], {})
+
+
+def categorize(data: pd.DataFrame, columns) -> pd.DataFrame:
+    """
+    Store low-cardinality string columns (labels, types) as categoricals.
+    """
+    for column in columns:
+        if column in data.columns:
+            data[column] = data[column].astype("category")
+    return data
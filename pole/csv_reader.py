@@ -0,0 +1,30 @@
+import pandas as pd
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def read_csv_selected(path, columns, filters, chunksize: int = DEFAULT_CHUNK_SIZE):
+    """
+    Read only the requested columns of a CSV file (all as str) in chunks,
+    keeping the rows accepted by ``filters``.
+
+    ``columns`` may name columns the file does not have; they are ignored, so
+    callers can ask for every field they might use. ``filters`` is a function
+    from a chunk to a boolean row mask and is applied per chunk, so rows of
+    unselected types are never accumulated.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = set(columns)
+    usecols = [column for column in header if column in wanted]
+    logger.info(f"Reading {len(usecols)} of {len(header)} columns from {path}.")
+
+    chunks = [
+        chunk[filters(chunk)]
+        for chunk in pd.read_csv(path, dtype=str, usecols=usecols, chunksize=chunksize)
+    ]
+    if not chunks:
+        return pd.DataFrame(columns=usecols, dtype=str)
+    return pd.concat(chunks, ignore_index=True)
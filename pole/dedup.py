@@ -0,0 +1,204 @@
+import os
+import pickle
+import tempfile
+from typing import Optional
+from biocypher._deduplicate import Deduplicator
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+DEFAULT_MAX_EDGES_IN_MEMORY = 1_000_000
+DEFAULT_NUM_PARTITIONS = 64
+MAX_PARTITION_DEPTH = 4
+
+
+def _edge_key(edge):
+    """
+    Return the identity of an edge tuple: (start, end, type).
+    """
+    _id, _start, _end, _type, _props = edge
+    return (_start, _end, _type)
+
+
+def _partition_of(key, num_partitions, depth):
+    """
+    Assign an edge key to a spill partition. The depth acts as a salt so that
+    a partition which is split again spreads over new buckets.
+    """
+    return hash((depth, key)) % num_partitions
+
+
+def _spill(edges, spill_dir, num_partitions, depth):
+    """
+    Write edges into hash-partitioned pickle files. Returns the list of
+    partition file paths that received at least one edge.
+    """
+    paths = [
+        os.path.join(spill_dir, f"edges_d{depth}_p{i}.pkl")
+        for i in range(num_partitions)
+    ]
+    handles = {}
+    try:
+        for edge in edges:
+            p = _partition_of(_edge_key(edge), num_partitions, depth)
+            if p not in handles:
+                handles[p] = open(paths[p], "wb")
+            pickle.dump(edge, handles[p], protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return [paths[p] for p in sorted(handles)]
+
+
+def _read_spill(path):
+    """
+    Stream edges back from a spill file.
+    """
+    with open(path, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def _dedup_partition(path, spill_dir, max_edges_in_memory, num_partitions, depth):
+    """
+    Deduplicate a single spill file. If the partition holds more unique edges
+    than the memory budget allows, it is re-partitioned with a new salt.
+    """
+    seen = set()
+    overflow = False
+    for edge in _read_spill(path):
+        key = _edge_key(edge)
+        if key in seen:
+            continue
+        if len(seen) >= max_edges_in_memory and depth < MAX_PARTITION_DEPTH:
+            overflow = True
+            break
+        seen.add(key)
+
+    if overflow:
+        logger.info(
+            f"Partition {os.path.basename(path)} exceeds memory budget, "
+            f"re-partitioning at depth {depth + 1}."
+        )
+        seen = None
+        sub_paths = _spill(_read_spill(path), spill_dir, num_partitions, depth + 1)
+        os.remove(path)
+        for sub_path in sub_paths:
+            yield from _dedup_partition(
+                sub_path, spill_dir, max_edges_in_memory, num_partitions, depth + 1
+            )
+        return
+
+    seen = set()
+    for edge in _read_spill(path):
+        key = _edge_key(edge)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield edge
+    os.remove(path)
+
+
+def deduplicate_edges(
+    edges,
+    max_edges_in_memory: int = DEFAULT_MAX_EDGES_IN_MEMORY,
+    num_partitions: int = DEFAULT_NUM_PARTITIONS,
+    spill_dir: Optional[str] = None,
+):
+    """
+    Streaming deduplication of edge tuples on (start, end, type), sitting
+    between an adapter's get_edges() and BioCypher's write_edges().
+
+    Unique edges are yielded straight through while the set of seen keys fits
+    the memory budget. Once it is exceeded, the seen set is frozen and every
+    edge not already in it is hash-partitioned into spill files on disk. Each
+    partition is then deduplicated independently. The first occurrence of an
+    edge (including its properties) is kept.
+
+    BioCypher's writer deduplicates edges as well and keeps every unique edge
+    key in memory while doing so. Call replace_biocypher_edge_dedup() on the
+    BioCypher instance so that the edge keys are only held here; otherwise
+    memory still grows with the number of unique edges.
+    """
+    seen = set()
+    edges = iter(edges)
+    total = 0
+    emitted = 0
+
+    def _remaining():
+        nonlocal total
+        for edge in edges:
+            total += 1
+            if _edge_key(edge) not in seen:
+                yield edge
+
+    for edge in edges:
+        total += 1
+        key = _edge_key(edge)
+        if key in seen:
+            continue
+        if len(seen) >= max_edges_in_memory:
+            logger.info(
+                f"Edge deduplication exceeded {max_edges_in_memory} unique "
+                f"edges in memory, spilling to {num_partitions} partitions."
+            )
+            with tempfile.TemporaryDirectory(
+                prefix="pole-dedup-", dir=spill_dir
+            ) as tmp_dir:
+                paths = _spill(
+                    _chain_first(edge, _remaining()), tmp_dir, num_partitions, 0
+                )
+                seen = None
+                for path in paths:
+                    for unique_edge in _dedup_partition(
+                        path, tmp_dir, max_edges_in_memory, num_partitions, 0
+                    ):
+                        emitted += 1
+                        yield unique_edge
+            break
+        seen.add(key)
+        emitted += 1
+        yield edge
+
+    logger.info(
+        f"Edge deduplication: {total} edges in, {emitted} unique edges out."
+    )
+
+
+class _TypeOnlyEdgeDeduplicator(Deduplicator):
+    """
+    BioCypher deduplicator that keeps no per-edge keys. Node deduplication is
+    unchanged and the edge types are still recorded, since write_schema_info()
+    reads them from here.
+    """
+
+    def edge_seen(self, relationship) -> bool:
+        self.seen_relationships.setdefault(relationship.get_type(), set())
+        return False
+
+
+def replace_biocypher_edge_dedup(bc):
+    """
+    Stop BioCypher from deduplicating edges itself, leaving it to
+    deduplicate_edges(). Only use this when every edge written through ``bc``
+    passes through deduplicate_edges() first.
+    """
+    current = bc._get_deduplicator()
+    if isinstance(current, _TypeOnlyEdgeDeduplicator):
+        return
+    deduplicator = _TypeOnlyEdgeDeduplicator()
+    deduplicator.__dict__.update(current.__dict__)
+    bc._deduplicator = deduplicator
+    if bc._writer:
+        bc._writer.deduplicator = deduplicator
+
+
+def _chain_first(first, rest):
+    """
+    Yield a single item followed by the items of an iterator.
+    """
+    yield first
+    yield from rest
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import pickle
+import urllib.request
+from biocypher import __version__ as biocypher_version
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+DEFAULT_CACHE_DIR = ".cache/pole-ontology"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_key(bc):
+    """
+    Key the resolved ontology by everything it is built from: the head and
+    tail ontology configuration (URL, which carries the version tag, root
+    node, format), the contents of the schema config and the BioCypher
+    version that produced the pickle.
+    """
+    schema_hash = None
+    if bc._schema_config_path:
+        with open(bc._schema_config_path, "rb") as file:
+            schema_hash = _sha256(file.read())
+
+    key = {
+        "head_ontology": bc._head_ontology,
+        "tail_ontologies": bc._tail_ontologies,
+        "schema_config": schema_hash,
+        "biocypher": biocypher_version,
+    }
+    return _sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8"))[:16]
+
+
+def _localize(ontology_meta, cache_dir):
+    """
+    Return a copy of an ontology config entry whose ``url`` points to a local
+    copy of the ontology file, downloading it into the cache on first use.
+    Local paths are returned unchanged.
+    """
+    url = ontology_meta["url"]
+    if not url.startswith(("http://", "https://")):
+        return ontology_meta
+
+    # Keep the extension, BioCypher derives the RDF format from it.
+    extension = os.path.splitext(url.split("?", 1)[0])[1]
+    local_path = os.path.join(
+        cache_dir, f"{_sha256(url.encode('utf-8'))[:16]}{extension}"
+    )
+    if not os.path.exists(local_path):
+        logger.info(f"Downloading ontology {url} to {local_path}.")
+        tmp_path = f"{local_path}.part"
+        urllib.request.urlretrieve(url, tmp_path)
+        os.replace(tmp_path, local_path)
+    return {**ontology_meta, "url": local_path}
+
+
+def _strip_rdf_graphs(ontology):
+    """
+    Drop the rdflib graphs kept by the ontology adapters. They are only
+    needed while the ontology is being built and dominate the pickle size.
+    """
+    adapters = [ontology._head_ontology]
+    if ontology._tail_ontologies:
+        adapters += list(ontology._tail_ontologies.values())
+    for adapter in adapters:
+        adapter._rdf_graph = None
+
+
+def load_cached_ontology(bc, cache_dir: str = DEFAULT_CACHE_DIR):
+    """
+    Attach the resolved ontology (head ontology joined with the schema
+    config mapping) to a BioCypher instance, from the cache if possible.
+
+    On a cache hit the pickled ontology is loaded without any network access
+    or RDF parsing. On a miss, the ontology files are downloaded into the
+    cache (or taken from there if present), BioCypher builds the ontology as
+    usual, and the result is pickled for the next build.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"ontology-{_cache_key(bc)}.pkl")
+
+    if os.path.exists(path):
+        logger.info(f"Loading cached ontology from {path}.")
+        with open(path, "rb") as file:
+            ontology = pickle.load(file)
+    else:
+        logger.info("No cached ontology found, building it.")
+        bc._head_ontology = _localize(bc._head_ontology, cache_dir)
+        if bc._tail_ontologies:
+            bc._tail_ontologies = {
+                name: _localize(meta, cache_dir)
+                for name, meta in bc._tail_ontologies.items()
+            }
+        ontology = bc._get_ontology()
+        _strip_rdf_graphs(ontology)
+
+        tmp_path = f"{path}.part"
+        try:
+            with open(tmp_path, "wb") as file:
+                pickle.dump(ontology, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            logger.info(f"Cached ontology in {path}.")
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            logger.warning(f"Could not cache ontology: {error}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    bc._ontology = ontology
+    bc._ontology_mapping = ontology.mapping
+    return ontology
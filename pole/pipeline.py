@@ -0,0 +1,161 @@
+import multiprocessing
+import queue
+import threading
+import traceback
+from biocypher._logger import logger
+from pole.dedup import deduplicate_edges, replace_biocypher_edge_dedup
+
+logger.debug(f"Loading module {__name__}.")
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_MAX_QUEUED_BATCHES = 8
+# Seconds to wait on a queue before checking that the producers are alive.
+POLL_INTERVAL = 5.0
+
+# Queue messages are (kind, payload) tuples so they survive pickling when
+# producers run in separate processes.
+_BATCH = "batch"
+_DONE = "done"
+_ERROR = "error"
+
+
+def _batched(items, batch_size):
+    """
+    Group an iterable into lists of at most batch_size items.
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _produce(name, adapter_class, adapter_kwargs, node_queue, edge_queue, batch_size):
+    """
+    Producer body: construct the adapter (network fetch and DataFrame
+    construction happen here) and stream its nodes, then its edges, into the
+    bounded queues. Nodes are always closed before edges are started so the
+    node consumer never waits on a producer that is blocked on the edge queue.
+    Completion is signalled with the producer's name.
+    """
+    current = node_queue
+    try:
+        adapter = adapter_class(**adapter_kwargs)
+        for batch in _batched(adapter.get_nodes(), batch_size):
+            node_queue.put((_BATCH, batch))
+        node_queue.put((_DONE, name))
+
+        current = edge_queue
+        for batch in _batched(adapter.get_edges(), batch_size):
+            edge_queue.put((_BATCH, batch))
+        edge_queue.put((_DONE, name))
+    except Exception:
+        message = f"{adapter_class.__name__} failed:\n{traceback.format_exc()}"
+        current.put((_ERROR, message))
+        if current is node_queue:
+            edge_queue.put((_ERROR, message))
+
+
+def _consume(q, producers):
+    """
+    Yield items from a queue until every producer has signalled completion.
+
+    A producer that dies without signalling (killed, out of memory) cannot
+    report an error itself, so while the queue is empty the producers are
+    checked for liveness. One that is still found dead on the next empty
+    poll, after anything it sent has been drained, fails the build.
+    """
+    pending = {producer.name: producer for producer in producers}
+    exited = set()
+    while pending:
+        try:
+            kind, payload = q.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            dead = {name for name, producer in pending.items() if not producer.is_alive()}
+            lost = dead & exited
+            if lost:
+                name = sorted(lost)[0]
+                exitcode = getattr(pending[name], "exitcode", None)
+                raise RuntimeError(
+                    f"Pipeline producer {name} exited without finishing "
+                    f"(exit code {exitcode})."
+                )
+            exited = dead
+            continue
+        if kind == _BATCH:
+            yield from payload
+        elif kind == _DONE:
+            logger.info(f"{payload} finished producing.")
+            del pending[payload]
+        else:
+            raise RuntimeError(f"Pipeline producer error: {payload}")
+
+
+def build_pipelined(
+    bc,
+    adapters,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_queued_batches: int = DEFAULT_MAX_QUEUED_BATCHES,
+    use_processes: bool = False,
+    deduplicate: bool = True,
+):
+    """
+    Write nodes and edges of several adapters through BioCypher with fetch,
+    transform and write overlapping.
+
+    Each entry of ``adapters`` is an adapter class or an ``(adapter_class,
+    kwargs)`` tuple. Every adapter is constructed and iterated in its own
+    producer thread (or process, if ``use_processes`` is set), feeding batches
+    into bounded node and edge queues. The calling thread consumes the queues
+    as a single node stream and a single edge stream for ``bc.write_nodes``
+    and ``bc.write_edges``. The queue bound provides backpressure, so at most
+    ``max_queued_batches * batch_size`` items are buffered per queue.
+
+    With ``deduplicate`` set, edges are deduplicated by deduplicate_edges()
+    instead of by BioCypher.
+    """
+    specs = [
+        (spec, {}) if isinstance(spec, type) else (spec[0], dict(spec[1]))
+        for spec in adapters
+    ]
+
+    if use_processes:
+        node_queue = multiprocessing.Queue(maxsize=max_queued_batches)
+        edge_queue = multiprocessing.Queue(maxsize=max_queued_batches)
+        worker = multiprocessing.Process
+    else:
+        node_queue = queue.Queue(maxsize=max_queued_batches)
+        edge_queue = queue.Queue(maxsize=max_queued_batches)
+        worker = threading.Thread
+
+    producers = []
+    for index, (adapter_class, kwargs) in enumerate(specs):
+        name = f"pole-producer-{index}-{adapter_class.__name__}"
+        producers.append(
+            worker(
+                target=_produce,
+                args=(name, adapter_class, kwargs, node_queue, edge_queue, batch_size),
+                name=name,
+                daemon=True,
+            )
+        )
+    logger.info(
+        f"Starting pipelined build with {len(producers)} "
+        f"{'process' if use_processes else 'thread'} producers."
+    )
+    for producer in producers:
+        producer.start()
+
+    bc.write_nodes(_consume(node_queue, producers))
+
+    edges = _consume(edge_queue, producers)
+    if deduplicate:
+        replace_biocypher_edge_dedup(bc)
+        edges = deduplicate_edges(edges)
+    bc.write_edges(edges)
+
+    for producer in producers:
+        producer.join()
@@ -0,0 +1,87 @@
+import gzip
+import os
+import rdflib
+from rdflib.store import Store
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+RDF = str(rdflib.RDF)
+
+FORMATS_BY_EXTENSION = {
+    ".nt": "nt",
+    ".ntriples": "nt",
+    ".ttl": "turtle",
+    ".turtle": "turtle",
+    ".rdf": "xml",
+    ".owl": "xml",
+    ".xml": "xml",
+}
+
+
+def _open(path):
+    """
+    Open a dump in binary mode, transparently decompressing .gz files.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def guess_format(path):
+    """
+    Guess the serialization of a dump from its extension (ignoring .gz), or
+    from its first bytes if the extension is not known.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension in FORMATS_BY_EXTENSION:
+        return FORMATS_BY_EXTENSION[extension]
+
+    with _open(path) as file:
+        head = file.read(4096).decode("utf-8", errors="ignore").lstrip()
+    if head.startswith("<?xml") or head.startswith("<rdf:RDF"):
+        return "xml"
+    return "turtle"
+
+
+def _term(term):
+    """
+    Plain string form of an rdflib term: IRIs without angle brackets, blank
+    nodes as ``_:label`` and literals as their lexical value, i.e. what a
+    SPARQL JSON result reports as ``value``.
+    """
+    if isinstance(term, rdflib.BNode):
+        return f"_:{term}"
+    return str(term)
+
+
+class _TripleSink(Store):
+    """
+    rdflib store that keeps nothing and hands every parsed triple to a
+    callback, so the parsers can run without building a graph.
+    """
+
+    def __init__(self, handle):
+        super().__init__()
+        self._handle = handle
+
+    def add(self, triple, context, quoted=False):
+        subject, predicate, obj = triple
+        self._handle(_term(subject), _term(predicate), _term(obj))
+
+
+def parse_triples(path, handle, format=None):
+    """
+    Parse an RDF dump in N-Triples, Turtle or RDF/XML, optionally gzipped,
+    with rdflib and call ``handle(subject, predicate, object)`` for every
+    triple, with the terms as plain strings (see _term).
+
+    No graph is built. The N-Triples and RDF/XML parsers stream the file;
+    rdflib's Turtle parser reads the whole document text first.
+    """
+    format = format or guess_format(path)
+    logger.info(f"Parsing {format} triples from {path}.")
+    graph = rdflib.Graph(store=_TripleSink(handle))
+    with _open(path) as file:
+        graph.parse(source=file, format=format)
@@ -0,0 +1,53 @@
+import os
+import random
+
+from pole.dedup import deduplicate_edges
+
+
+def _edges(num_keys, copies, seed=0):
+    """
+    Edge tuples over num_keys distinct (start, end, type) keys, each repeated
+    copies times in shuffled order. The props record the occurrence number.
+    """
+    keys = [(f"n{i % 7}", f"n{i}", f"type{i % 3}") for i in range(num_keys)]
+    order = [key for key in keys for _ in range(copies)]
+    random.Random(seed).shuffle(order)
+    occurrences = {}
+    edges = []
+    for start, end, edge_type in order:
+        occurrence = occurrences.get((start, end, edge_type), 0)
+        occurrences[(start, end, edge_type)] = occurrence + 1
+        edges.append((None, start, end, edge_type, {"occurrence": occurrence}))
+    return edges
+
+
+def _check(edges, unique_edges):
+    keys = [(start, end, edge_type) for _, start, end, edge_type, _ in unique_edges]
+    assert len(keys) == len(set(keys))
+    assert set(keys) == {(start, end, edge_type) for _, start, end, edge_type, _ in edges}
+    assert all(props == {"occurrence": 0} for *_, props in unique_edges)
+
+
+def test_dedup_in_memory():
+    edges = _edges(50, 3)
+    _check(edges, list(deduplicate_edges(edges)))
+
+
+def test_dedup_spills_to_partitions(tmp_path):
+    edges = _edges(200, 3)
+    unique_edges = list(
+        deduplicate_edges(edges, max_edges_in_memory=10, num_partitions=4, spill_dir=tmp_path)
+    )
+    _check(edges, unique_edges)
+    assert os.listdir(tmp_path) == []
+
+
+def test_dedup_repartitions_up_to_depth_cap(tmp_path):
+    # One unique edge per partition is never enough, so partitions are split
+    # until the depth cap and then deduplicated over budget.
+    edges = _edges(100, 2)
+    unique_edges = list(
+        deduplicate_edges(edges, max_edges_in_memory=1, num_partitions=2, spill_dir=tmp_path)
+    )
+    _check(edges, unique_edges)
+    assert os.listdir(tmp_path) == []
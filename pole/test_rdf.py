@@ -0,0 +1,48 @@
+import gzip
+
+from pole.adapters.aop_adapter import read_aopwiki_dump
+from pole.rdf import parse_triples
+
+AOPWIKI_TURTLE = """\
+@prefix aopo: <http://aopkb.oecd.org/aopo#> .
+@prefix dc: <http://purl.org/dc/elements/1.1/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+<http://aop/ke/1> a aopo:KeyEvent ; dc:title "KE one" ; rdfs:label "KE 1" ;
+    dc:description "first" .
+<http://aop/ke/2> a aopo:KeyEvent ; dc:title "KE two" ; rdfs:label "KE 2" ;
+    dc:description "second" .
+<http://aop/ker/1> a aopo:KeyEventRelationship ;
+    aopo:has_upstream_key_event <http://aop/ke/1> ;
+    aopo:has_downstream_key_event <http://aop/ke/2> .
+<http://other/1> dc:title "not an AOP-Wiki entity" ; rdfs:label "other" .
+# ends with a comment and no newline"""
+
+
+def _triples(path):
+    triples = []
+    parse_triples(str(path), lambda *triple: triples.append(triple))
+    return triples
+
+
+def test_ntriples_trailing_comment(tmp_path):
+    path = tmp_path / "dump.nt.gz"
+    with gzip.open(path, "wt") as file:
+        file.write('<http://a> <http://b> "c" . # note\n')
+    assert _triples(path) == [("http://a", "http://b", "c")]
+
+
+def test_turtle_comment_at_end_of_file(tmp_path):
+    path = tmp_path / "dump.ttl"
+    path.write_text('<http://a> <http://b> "c" . # note')
+    assert _triples(path) == [("http://a", "http://b", "c")]
+
+
+def test_read_aopwiki_dump(tmp_path):
+    path = tmp_path / "aopwiki.ttl"
+    path.write_text(AOPWIKI_TURTLE)
+    results = read_aopwiki_dump([str(path)])
+
+    assert sorted(results["ke"]["KEID"]) == ["KE 1", "KE 2"]
+    assert results["aop"].empty
+    assert results["ker"].values.tolist() == [["http://aop/ker/1", "KE 1", "KE 2"]]
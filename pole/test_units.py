@@ -0,0 +1,50 @@
+import math
+
+import pandas as pd
+
+from pole.units import parse_concentration, parse_duration_hours
+
+
+def test_concentration_with_exponent():
+    parsed = parse_concentration(pd.Series(["1.5e-3 M", "2E+1 nM"]))
+    assert parsed["exposure_concentration_micromolar_min"].tolist() == [1500.0, 0.02]
+    assert parsed["exposure_concentration_mg_per_l_min"].isna().all()
+
+
+def test_concentration_mass_and_molar():
+    parsed = parse_concentration(pd.Series(["50mg/L", "0.3 micromolar, 10 micromolar"]))
+    assert parsed.loc[0, "exposure_concentration_mg_per_l_max"] == 50.0
+    assert parsed.loc[1, "exposure_concentration_micromolar_min"] == 0.3
+    assert parsed.loc[1, "exposure_concentration_micromolar_max"] == 10.0
+
+
+def test_concentration_thousands_separator():
+    parsed = parse_concentration(pd.Series(["1,000 mg/L", "1,0000 mg/L"]))
+    assert parsed.loc[0, "exposure_concentration_mg_per_l_min"] == 1000.0
+    assert parsed.loc[0, "exposure_concentration_mg_per_l_max"] == 1000.0
+    assert parsed.loc[1].isna().all()
+
+
+def test_concentration_unknown_unit_is_missing():
+    parsed = parse_concentration(pd.Series(["5 mg/kg", "10 mg/L and 5 mg/kg"]))
+    assert parsed.isna().all().all()
+
+
+def test_duration_ranges_and_recovery():
+    parsed = parse_duration_hours(
+        pd.Series([
+            "24h",
+            "24 hours, 96 hours",
+            "24 hours with 18 hours recovery",
+            "24 hours With 18 hours Recovery",
+        ])
+    )
+    assert parsed["exposure_duration_hours_min"].tolist() == [24.0, 24.0, 24.0, 24.0]
+    assert parsed["exposure_duration_hours_max"].tolist() == [24.0, 96.0, 24.0, 24.0]
+
+
+def test_duration_unknown_unit_is_missing():
+    parsed = parse_duration_hours(pd.Series(["2 hours/day for 3 days", None]))
+    assert math.isnan(parsed.loc[0, "exposure_duration_hours_min"])
+    assert math.isnan(parsed.loc[0, "exposure_duration_hours_max"])
+    assert parsed.loc[1].isna().all()
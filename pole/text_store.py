@@ -0,0 +1,99 @@
+import json
+import os
+import re
+import zlib
+from typing import Optional
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+DEFAULT_SNIPPET_LENGTH = 200
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def make_snippet(text, length: int = DEFAULT_SNIPPET_LENGTH):
+    """
+    Return a short single-line preview of a (possibly HTML-ish) text: tags
+    dropped, whitespace collapsed, cut at ``length`` characters.
+    """
+    text = _WHITESPACE_PATTERN.sub(" ", _TAG_PATTERN.sub(" ", text)).strip()
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0] + "..."
+
+
+def _paths(path):
+    return f"{path}.bin", f"{path}.idx.json"
+
+
+class TextStoreWriter:
+    """
+    Append-only writer for a compressed, offset-indexed text store.
+
+    Each text is zlib-compressed and appended to ``<path>.bin``; the
+    ``<path>.idx.json`` index maps a key (the node ID) to the offset and
+    length of its blob and is written on close.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._blob_path, self._index_path = _paths(path)
+        self._file = open(self._blob_path, "wb")
+        self._index = {}
+
+    def put(self, key, text):
+        """
+        Store a text under a key. The first text stored for a key wins.
+        """
+        if key in self._index:
+            return
+        blob = zlib.compress(text.encode("utf-8"))
+        self._index[key] = (self._file.tell(), len(blob))
+        self._file.write(blob)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        with open(self._index_path, "w", encoding="utf-8") as file:
+            json.dump(self._index, file)
+        logger.info(f"Wrote {len(self._index)} texts to {self._blob_path}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TextStore:
+    """
+    Read side of a text store written by TextStoreWriter. Texts are read and
+    decompressed on demand, so only the index is held in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._blob_path, self._index_path = _paths(path)
+        with open(self._index_path, "r", encoding="utf-8") as file:
+            self._index = json.load(file)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, key) -> Optional[str]:
+        """
+        Return the full text stored for a key, or None if there is none.
+        """
+        if key not in self._index:
+            return None
+        offset, length = self._index[key]
+        with open(self._blob_path, "rb") as file:
+            file.seek(offset)
+            return zlib.decompress(file.read(length)).decode("utf-8")
@@ -0,0 +1,119 @@
+import pandas as pd
+from biocypher._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+# A number followed by a unit, e.g. "24h", "50mg/L", "0.3 micromolar",
+# "1.5e-3 M", "1,000 mg/L". The lookbehind keeps it from starting inside
+# another number or word ("1.5e-3" must not yield "3", "1,0000" must not
+# yield "0000"). Values written out as words ("six hours") are not matched.
+_QUANTITY_PATTERN = (
+    r"(?<![\w.,+-])(?P<value>(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"\s*(?P<unit>[A-Za-zµμ]+(?:\s*/\s*[A-Za-z]+)?)"
+)
+
+# Conversion factors to hours.
+DURATION_UNITS = {
+    "s": 1 / 3600, "sec": 1 / 3600, "second": 1 / 3600, "seconds": 1 / 3600,
+    "min": 1 / 60, "mins": 1 / 60, "minute": 1 / 60, "minutes": 1 / 60,
+    "h": 1.0, "hr": 1.0, "hrs": 1.0, "hour": 1.0, "hours": 1.0,
+    "d": 24.0, "day": 24.0, "days": 24.0,
+    "w": 168.0, "wk": 168.0, "week": 168.0, "weeks": 168.0,
+}
+
+# Conversion factors to mg/L for mass concentrations.
+MASS_CONCENTRATION_UNITS = {
+    "g/l": 1e3, "mg/l": 1.0, "ug/l": 1e-3, "µg/l": 1e-3, "μg/l": 1e-3, "ng/l": 1e-6,
+    "mg/ml": 1e3, "ug/ml": 1.0, "µg/ml": 1.0, "μg/ml": 1.0, "ng/ml": 1e-3,
+}
+
+# Conversion factors to micromolar for molar concentrations. Keys are
+# lowercased, so "M" and "mM" become "m" and "mm".
+MOLAR_CONCENTRATION_UNITS = {
+    "m": 1e6, "molar": 1e6,
+    "mm": 1e3, "millimolar": 1e3,
+    "um": 1.0, "µm": 1.0, "μm": 1.0, "micromolar": 1.0,
+    "nm": 1e-3, "nanomolar": 1e-3,
+    "pm": 1e-6, "picomolar": 1e-6,
+}
+
+
+def _extract_quantities(values: pd.Series) -> pd.DataFrame:
+    """
+    Extract every (value, unit) pair from a string column. The result is
+    indexed by (original row, match number) with a float ``value`` and a
+    normalized lowercase ``unit`` column.
+    """
+    quantities = values.dropna().astype(str).str.extractall(_QUANTITY_PATTERN)
+    quantities["value"] = quantities["value"].str.replace(",", "").astype(float)
+    quantities["unit"] = (
+        quantities["unit"].str.lower().str.replace(r"\s+", "", regex=True)
+    )
+    return quantities
+
+
+def _drop_unknown_units(quantities: pd.DataFrame, known_units) -> pd.DataFrame:
+    """
+    Drop every quantity of a row that has any quantity with a unit outside
+    ``known_units``. A partial min/max of such a cell ("2 hours/day for 3
+    days") would be a wrong number rather than a missing one.
+    """
+    rows = quantities.index.get_level_values(0)
+    unknown = rows[~quantities["unit"].isin(known_units)]
+    return quantities[~rows.isin(unknown)]
+
+
+def _min_max(quantities: pd.DataFrame, units: dict, index, prefix: str) -> pd.DataFrame:
+    """
+    Convert the quantities whose unit is in ``units`` and reduce them per
+    original row to ``<prefix>_min`` and ``<prefix>_max`` columns.
+    """
+    factor = quantities["unit"].map(units)
+    converted = (quantities["value"] * factor).dropna()
+    grouped = converted.groupby(level=0)
+    return pd.DataFrame(
+        {f"{prefix}_min": grouped.min(), f"{prefix}_max": grouped.max()}
+    ).reindex(index)
+
+
+def parse_duration_hours(values: pd.Series) -> pd.DataFrame:
+    """
+    Parse exposure durations such as "24h" or "24 hours, 96 hours" into the
+    shortest and longest duration in hours. Recovery periods ("24 hours with
+    18 hours recovery") are not exposure time and are dropped. Cells with
+    any unit that is not a duration unit get NaN.
+    """
+    values = values.str.replace(r"with[^,]*recovery", "", case=False, regex=True)
+    quantities = _drop_unknown_units(_extract_quantities(values), DURATION_UNITS)
+    return _min_max(quantities, DURATION_UNITS, values.index, "exposure_duration_hours")
+
+
+def parse_concentration(values: pd.Series) -> pd.DataFrame:
+    """
+    Parse exposure concentrations such as "50mg/L" or "0.3 micromolar, 10
+    micromolar". Mass concentrations are normalized to mg/L and molar
+    concentrations to micromolar, since converting between the two needs the
+    molar mass of the chemical. Cells with any unit that is neither a mass
+    nor a molar concentration unit get NaN.
+    """
+    quantities = _drop_unknown_units(
+        _extract_quantities(values),
+        {**MASS_CONCENTRATION_UNITS, **MOLAR_CONCENTRATION_UNITS},
+    )
+    return pd.concat(
+        [
+            _min_max(
+                quantities,
+                MASS_CONCENTRATION_UNITS,
+                values.index,
+                "exposure_concentration_mg_per_l",
+            ),
+            _min_max(
+                quantities,
+                MOLAR_CONCENTRATION_UNITS,
+                values.index,
+                "exposure_concentration_micromolar",
+            ),
+        ],
+        axis=1,
+    )